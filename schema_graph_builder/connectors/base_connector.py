@@ -9,9 +9,9 @@ import os
 import yaml
 import logging
 from abc import ABC, abstractmethod
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, text, bindparam
 from sqlalchemy.pool import StaticPool
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from ..utils.security import CredentialManager, ConnectionSecurity, AuditLogger
 from ..utils.logging_config import get_logger
@@ -39,13 +39,23 @@ class DatabaseConnector(ABC):
         self.default_port = default_port
         self.audit_logger = AuditLogger()
         self.engine = None
+        self.schema_filter: Optional[Tuple[str, ...]] = None
+        self.table_filter: Optional[Tuple[str, ...]] = None
     
-    def extract_schema(self, config_path: str) -> Dict[str, Any]:
+    def extract_schema(
+        self,
+        config_path: str,
+        schemas: Optional[List[str]] = None,
+        tables: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Extract database schema with security enhancements.
         
         Args:
             config_path: Path to YAML configuration file
+            schemas: Optional list of schema names to extract tables from
+                (defaults to the connection's default schema)
+            tables: Optional list of table names to restrict extraction to
             
         Returns:
             Dictionary containing schema information
@@ -54,6 +64,9 @@ class DatabaseConnector(ABC):
             ValueError: If configuration is invalid
             ConnectionError: If database connection fails
         """
+        self.schema_filter = tuple(schemas) if schemas else None
+        self.table_filter = tuple(tables) if tables else None
+        
         try:
             # Load and validate configuration
             config = self._load_config(config_path)
@@ -181,9 +194,16 @@ class DatabaseConnector(ABC):
         }
         
         try:
-            table_names = inspector.get_table_names()
+            # Without a schema filter only the connection's default schema is listed
+            table_refs = [
+                (schema_name, table_name)
+                for schema_name in self.schema_filter or (None,)
+                for table_name in inspector.get_table_names(schema=schema_name)
+            ]
+            if self.table_filter:
+                table_refs = [ref for ref in table_refs if ref[1] in self.table_filter]
             
-            for table_name in table_names:
+            for schema_name, table_name in table_refs:
                 # Validate table name for security
                 if not table_name or not isinstance(table_name, str):
                     logger.warning(f"Skipping invalid table name: {table_name}")
@@ -194,10 +214,14 @@ class DatabaseConnector(ABC):
                     'columns': []
                 }
                 
+                # Record the schema when one was requested, so same-named tables stay distinct
+                if schema_name is not None:
+                    table_info['schema'] = schema_name
+                
                 # Get column information
                 try:
-                    columns = inspector.get_columns(table_name)
-                    pk_constraint = inspector.get_pk_constraint(table_name)
+                    columns = inspector.get_columns(table_name, schema=schema_name)
+                    pk_constraint = inspector.get_pk_constraint(table_name, schema=schema_name)
                     pk_columns = pk_constraint.get('constrained_columns', [])
                     
                     for column in columns:
@@ -225,6 +249,50 @@ class DatabaseConnector(ABC):
             error_msg = f"Failed to extract schema: {e}"
             raise ConnectionError(error_msg) from e
     
+    def _build_metadata_filter(
+        self, table_column: str, schema_column: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build SQL predicates restricting a metadata query to the requested schemas/tables.
+        
+        Args:
+            table_column: Qualified column holding the table name
+            schema_column: Qualified column holding the schema name, if the query has one
+            
+        Returns:
+            Tuple of (predicate SQL to append to the WHERE clause, bind parameters)
+        """
+        predicates: List[str] = []
+        params: Dict[str, Any] = {}
+        
+        if self.schema_filter and schema_column:
+            predicates.append(f"AND {schema_column} IN :schemas")
+            params['schemas'] = list(self.schema_filter)
+        
+        if self.table_filter:
+            predicates.append(f"AND {table_column} IN :tables")
+            params['tables'] = list(self.table_filter)
+        
+        return " ".join(predicates), params
+    
+    def _execute_metadata_query(self, conn, query: str, params: Dict[str, Any]):
+        """
+        Execute a metadata query, binding any filter parameters as expanding IN lists.
+        
+        Args:
+            conn: Open SQLAlchemy connection
+            query: SQL query text
+            params: Bind parameters from _build_metadata_filter
+            
+        Returns:
+            Query result
+        """
+        if not params:
+            return conn.execute(query)
+        
+        statement = text(query).bindparams(*(bindparam(name, expanding=True) for name in params))
+        return conn.execute(statement, params)
+    
     def _cleanup_connection(self) -> None:
         """Clean up database connection."""
         if self.engine:
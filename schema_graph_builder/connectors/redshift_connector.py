@@ -6,10 +6,19 @@ Redshift is based on PostgreSQL but has specific requirements for SSL connection
 and supports additional metadata like distribution keys and sort keys.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .base_connector import DatabaseConnector
 
 
+# Threshold-based performance checks: (statistic, threshold, message template)
+_THRESHOLD_RECOMMENDATIONS = (
+    ('unsorted_pct', 20, "Consider running VACUUM: {}% of table is unsorted"),
+    ('stats_off_pct', 10, "Consider running ANALYZE: {}% of statistics are outdated"),
+    ('sortkey1_skew', 4, "High sort key skew detected ({}): consider choosing a different sort key"),
+    ('row_skew', 4, "High row skew detected ({}): consider choosing a different distribution key"),
+)
+
+
 class RedshiftConnector(DatabaseConnector):
     """Amazon Redshift database connector implementation."""
     
@@ -151,6 +160,7 @@ class RedshiftConnector(DatabaseConnector):
         LEFT JOIN pg_catalog.pg_class c ON c.relname = sti.tablename
         LEFT JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace AND n.nspname = sti.schemaname
         WHERE sti.schemaname NOT IN ('information_schema', 'pg_catalog', 'pg_toast', 'pg_temp_1')
+        {filters}
         ORDER BY sti.schemaname, sti.tablename, sti.sortkey NULLS LAST
         """
         
@@ -159,8 +169,12 @@ class RedshiftConnector(DatabaseConnector):
             sort_key_types = self._detect_sort_key_types()
             table_dependencies = self._get_table_dependencies()
             
+            filters, params = self._build_metadata_filter('sti.tablename', 'sti.schemaname')
+            
             with self.engine.connect() as conn:
-                result = conn.execute(redshift_metadata_query)
+                result = self._execute_metadata_query(
+                    conn, redshift_metadata_query.format(filters=filters), params
+                )
                 
                 # Build lookup dictionaries for efficient access
                 table_metadata = {}
@@ -245,7 +259,7 @@ class RedshiftConnector(DatabaseConnector):
                 for table in schema.get('tables', []):
                     table_name = table['name']
                     # Assume public schema if not specified
-                    table_key = f"public.{table_name}"
+                    table_key = f"{table.get('schema', 'public')}.{table_name}"
                     
                     if table_key in table_metadata:
                         metadata = table_metadata[table_key]
@@ -296,28 +310,14 @@ class RedshiftConnector(DatabaseConnector):
         Returns:
             List of performance recommendations
         """
-        recommendations = []
         stats = metadata.get('table_statistics', {})
         
-        # Check for high unsorted percentage
-        unsorted_pct = stats.get('unsorted_pct', 0)
-        if unsorted_pct > 20:
-            recommendations.append(f"Consider running VACUUM: {unsorted_pct}% of table is unsorted")
-        
-        # Check for outdated statistics
-        stats_off_pct = stats.get('stats_off_pct', 0)
-        if stats_off_pct > 10:
-            recommendations.append(f"Consider running ANALYZE: {stats_off_pct}% of statistics are outdated")
-        
-        # Check for high sort key skew
-        sortkey1_skew = stats.get('sortkey1_skew', 0)
-        if sortkey1_skew > 4:
-            recommendations.append(f"High sort key skew detected ({sortkey1_skew}): consider choosing a different sort key")
-        
-        # Check for high row skew
-        row_skew = stats.get('row_skew', 0)
-        if row_skew > 4:
-            recommendations.append(f"High row skew detected ({row_skew}): consider choosing a different distribution key")
+        # Simple "statistic exceeds threshold" checks share a single rule table
+        recommendations = [
+            message.format(stats.get(stat, 0))
+            for stat, threshold, message in _THRESHOLD_RECOMMENDATIONS
+            if stats.get(stat, 0) > threshold
+        ]
         
         # Check for small tables that might benefit from DISTSTYLE ALL
         size_mb = stats.get('size_mb', 0)
@@ -359,12 +359,17 @@ class RedshiftConnector(DatabaseConnector):
             parameters
         FROM svv_external_tables
         WHERE schemaname NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
+        {filters}
         ORDER BY schemaname, tablename
         """
         
         try:
+            filters, params = self._build_metadata_filter('tablename', 'schemaname')
+            
             with self.engine.connect() as conn:
-                result = conn.execute(external_tables_query)
+                result = self._execute_metadata_query(
+                    conn, external_tables_query.format(filters=filters), params
+                )
                 
                 # Build lookup dictionary for external tables
                 external_metadata = {}
@@ -387,7 +392,7 @@ class RedshiftConnector(DatabaseConnector):
                 # Add external table metadata to schema tables
                 for table in schema.get('tables', []):
                     table_name = table['name']
-                    table_key = f"public.{table_name}"
+                    table_key = f"{table.get('schema', 'public')}.{table_name}"
                     
                     if table_key in external_metadata:
                         if 'redshift_metadata' not in table:
@@ -450,10 +455,14 @@ class RedshiftConnector(DatabaseConnector):
                 WHERE c.relkind = 'r'
                 AND n.nspname NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
                 AND c.relhassubclass = 'f'
+                {filters}
                 ORDER BY n.nspname, c.relname
                 """
                 
-                result = conn.execute(sort_key_query)
+                filters, params = self._build_metadata_filter('c.relname', 'n.nspname')
+                result = self._execute_metadata_query(
+                    conn, sort_key_query.format(filters=filters), params
+                )
                 
                 for row in result:
                     schema_name = row[0]
@@ -497,10 +506,14 @@ class RedshiftConnector(DatabaseConnector):
                 JOIN pg_namespace source_ns ON source_ns.oid = source_table.relnamespace
                 WHERE source_table.relkind in ('r', 'v', 'f')
                 AND dependent_ns.nspname NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
+                {filters}
                 ORDER BY dependent_schema, dependent_table
                 """
                 
-                result = conn.execute(dependencies_query)
+                filters, params = self._build_metadata_filter('dependent_view.relname', 'dependent_ns.nspname')
+                result = self._execute_metadata_query(
+                    conn, dependencies_query.format(filters=filters), params
+                )
                 
                 for row in result:
                     dependent_table = f"{row[0]}.{row[1]}"
@@ -520,12 +533,18 @@ class RedshiftConnector(DatabaseConnector):
         return dependencies
 
 
-def get_redshift_schema(config_path: str) -> Dict[str, Any]:
+def get_redshift_schema(
+    config_path: str,
+    schemas: Optional[List[str]] = None,
+    tables: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Extract schema from Amazon Redshift database.
     
     Args:
         config_path: Path to YAML configuration file
+        schemas: Optional list of schema names to extract tables from; also pushed down into the metadata queries
+        tables: Optional list of table names; only these tables are extracted
         
     Returns:
         Dictionary containing schema information with Redshift-specific metadata
@@ -541,4 +560,4 @@ def get_redshift_schema(config_path: str) -> Dict[str, Any]:
         ...         print(f"Table {table['name']} uses distribution key: {redshift_meta['distribution_key']}")
     """
     connector = RedshiftConnector()
-    return connector.extract_schema(config_path) 
\ No newline at end of file
+    return connector.extract_schema(config_path, schemas=schemas, tables=tables) 
\ No newline at end of file
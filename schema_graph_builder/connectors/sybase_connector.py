@@ -6,7 +6,7 @@ Sybase is commonly used in enterprise environments, especially legacy systems an
 financial services organizations.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from .base_connector import DatabaseConnector
 
 
@@ -183,12 +183,17 @@ class SybaseConnector(DatabaseConnector):
         JOIN systypes t ON c.usertype = t.usertype
         LEFT JOIN syscomments d ON c.cdefault = d.id
         WHERE u.type = 'U'  -- User tables only
+        {filters}
         ORDER BY u.name, c.colid
         """
         
         try:
+            filters, params = self._build_metadata_filter('u.name', 'user_name(u.uid)')
+            
             with self.engine.connect() as conn:
-                result = conn.execute(sybase_metadata_query)
+                result = self._execute_metadata_query(
+                    conn, sybase_metadata_query.format(filters=filters), params
+                )
                 
                 # Build metadata lookup
                 table_metadata = {}
@@ -283,12 +288,18 @@ class SybaseConnector(DatabaseConnector):
             return []
 
 
-def get_sybase_schema(config_path: str) -> Dict[str, Any]:
+def get_sybase_schema(
+    config_path: str,
+    schemas: Optional[List[str]] = None,
+    tables: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Extract schema information from a Sybase database.
     
     Args:
         config_path: Path to the YAML configuration file
+        schemas: Optional list of owner (schema) names to extract tables from; also pushed down into the metadata query
+        tables: Optional list of table names; only these tables are extracted
         
     Returns:
         Dictionary containing schema information
@@ -297,4 +308,4 @@ def get_sybase_schema(config_path: str) -> Dict[str, Any]:
         Exception: If connection fails or schema extraction fails
     """
     connector = SybaseConnector()
-    return connector.extract_schema(config_path) 
\ No newline at end of file
+    return connector.extract_schema(config_path, schemas=schemas, tables=tables) 
\ No newline at end of file
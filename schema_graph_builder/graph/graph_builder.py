@@ -2,11 +2,82 @@
 Graph builder module - Creates graph visualizations from schema and relationships
 """
 
+import copy
 import json
+import os
+import string
 import yaml
+from collections import OrderedDict
+from functools import lru_cache
 import networkx as nx
 from pyvis.network import Network
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+# Optional fast JSON serializer - fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# libyaml-backed loader when PyYAML was built with it
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed relationship files keyed by absolute path -> (mtime_ns, size, data)
+_YAML_CACHE: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+_YAML_CACHE_MAX_ENTRIES = 100
+
+# Database-specific HTML output names, checked in order against the JSON path
+_HTML_FILENAMES = (
+    ('postgres', 'postgres_schema_graph.html'),
+    ('mysql', 'mysql_schema_graph.html'),
+    ('mssql', 'mssql_schema_graph.html'),
+)
+_DEFAULT_HTML_FILENAME = 'schema_graph.html'
+
+# vis.js page used when pyvis rendering fails; compiled once at import
+_FALLBACK_TEMPLATE = string.Template("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>$title</title>
+        <script type="text/javascript" src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
+        <style type="text/css">
+            #mynetworkid {
+                width: 100%;
+                height: 600px;
+                border: 1px solid lightgray;
+            }
+        </style>
+    </head>
+    <body>
+        <h1>$title</h1>
+        <div id="mynetworkid"></div>
+
+        <script type="text/javascript">
+            var nodes = new vis.DataSet($nodes);
+            var edges = new vis.DataSet($edges);
+            var container = document.getElementById('mynetworkid');
+            var data = {
+                nodes: nodes,
+                edges: edges
+            };
+            var options = {
+                physics: {
+                    enabled: true,
+                    stabilization: {iterations: 100}
+                },
+                edges: {
+                    arrows: {
+                        to: {enabled: true, scaleFactor: 1}
+                    }
+                }
+            };
+            var network = new vis.Network(container, data, options);
+        </script>
+    </body>
+    </html>
+    """)
 
 
 def build_graph(schema: Dict[str, Any], relationships_file: str, 
@@ -21,8 +92,7 @@ def build_graph(schema: Dict[str, Any], relationships_file: str,
         output_json_path: Path to save JSON graph data
     """
     # Load relationships
-    with open(relationships_file, 'r') as f:
-        relationships = yaml.safe_load(f)
+    relationships = _load_relationships(relationships_file)
     
     # Create NetworkX directed graph
     G = nx.DiGraph()
@@ -44,20 +114,11 @@ def build_graph(schema: Dict[str, Any], relationships_file: str,
     
     # Save graph data as JSON
     graph_data = nx.readwrite.json_graph.node_link_data(G)
-    with open(output_json_path, 'w') as f:
-        json.dump(graph_data, f, indent=2)
+    _write_json(graph_data, output_json_path)
     
     # Create visualization if requested
     if visualize:
-        html_filename = output_json_path.replace('.json', '.html')
-        if 'postgres' in output_json_path:
-            html_filename = 'postgres_schema_graph.html'
-        elif 'mysql' in output_json_path:
-            html_filename = 'mysql_schema_graph.html'
-        elif 'mssql' in output_json_path:
-            html_filename = 'mssql_schema_graph.html'
-        else:
-            html_filename = 'schema_graph.html'
+        html_filename = _html_name_for(output_json_path)
         
         try:
             _create_pyvis_visualization(G, html_filename)
@@ -66,6 +127,66 @@ def build_graph(schema: Dict[str, Any], relationships_file: str,
             _create_fallback_html(G, html_filename)
 
 
+def _to_json(data: Any) -> str:
+    """Serialize data to a compact JSON string, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data)
+
+
+def _write_json(data: Any, output_path: str):
+    """Write data as indented JSON, serializing in one pass with orjson when available."""
+    if ORJSON_AVAILABLE:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+@lru_cache(maxsize=128)
+def _html_name_for(json_path: str) -> str:
+    """Return the visualization HTML filename for a JSON output path."""
+    return next(
+        (html_name for marker, html_name in _HTML_FILENAMES if marker in json_path),
+        _DEFAULT_HTML_FILENAME
+    )
+
+
+def _load_relationships(relationships_file: str) -> Dict[str, Any]:
+    """
+    Load a relationships YAML file, reusing the parsed result while the file is unchanged.
+    
+    Args:
+        relationships_file: Path to YAML file with relationship information
+        
+    Returns:
+        Parsed relationships dictionary (a private copy the caller may modify)
+    """
+    try:
+        stat = os.stat(relationships_file)
+    except OSError:
+        stat = None
+    
+    if stat is not None:
+        cache_key = os.path.abspath(relationships_file)
+        cached = _YAML_CACHE.get(cache_key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            _YAML_CACHE.move_to_end(cache_key)
+            return copy.deepcopy(cached[2])
+    
+    with open(relationships_file, 'r') as f:
+        relationships = yaml.load(f, Loader=_SafeLoader)
+    
+    if stat is not None:
+        _YAML_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, copy.deepcopy(relationships))
+        _YAML_CACHE.move_to_end(cache_key)
+        while len(_YAML_CACHE) > _YAML_CACHE_MAX_ENTRIES:
+            _YAML_CACHE.popitem(last=False)
+    
+    return relationships
+
+
 def _create_pyvis_visualization(G: nx.DiGraph, output_file: str):
     """Create interactive visualization using Pyvis."""
     net = Network(height="600px", width="100%", bgcolor="#ffffff", font_color="black")
@@ -118,48 +239,11 @@ def _create_fallback_html(G: nx.DiGraph, output_file: str):
             "arrows": "to"
         })
     
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Database Schema Relationships</title>
-        <script type="text/javascript" src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
-        <style type="text/css">
-            #mynetworkid {{
-                width: 100%;
-                height: 600px;
-                border: 1px solid lightgray;
-            }}
-        </style>
-    </head>
-    <body>
-        <h1>Database Schema Relationships</h1>
-        <div id="mynetworkid"></div>
-
-        <script type="text/javascript">
-            var nodes = new vis.DataSet({json.dumps(nodes)});
-            var edges = new vis.DataSet({json.dumps(edges)});
-            var container = document.getElementById('mynetworkid');
-            var data = {{
-                nodes: nodes,
-                edges: edges
-            }};
-            var options = {{
-                physics: {{
-                    enabled: true,
-                    stabilization: {{iterations: 100}}
-                }},
-                edges: {{
-                    arrows: {{
-                        to: {{enabled: true, scaleFactor: 1}}
-                    }}
-                }}
-            }};
-            var network = new vis.Network(container, data, options);
-        </script>
-    </body>
-    </html>
-    """
+    html_content = _FALLBACK_TEMPLATE.substitute(
+        title='Database Schema Relationships',
+        nodes=_to_json(nodes),
+        edges=_to_json(edges)
+    )
     
-    with open(output_file, 'w') as f:
+    with open(output_file, 'w', encoding='utf-8') as f:
         f.write(html_content) 
\ No newline at end of file
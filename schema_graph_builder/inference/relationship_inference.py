@@ -3,7 +3,7 @@ Relationship inference module - Infers foreign key relationships from database s
 """
 
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, FrozenSet, Optional, Tuple
 
 
 def infer_relationships(schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -38,6 +38,17 @@ def infer_relationships(schema: Dict[str, Any]) -> Dict[str, Any]:
         pk = _find_primary_key(table)
         table_primary_keys[table_name] = pk
     
+    # Normalize every referenceable primary key once, instead of once per column
+    reference_keys = [
+        (ref_table_name, ref_pk) + _normalize_reference(ref_pk, ref_table_name)
+        for ref_table_name, ref_pk in table_primary_keys.items()
+        if ref_pk
+    ]
+    
+    # Index the references by primary key, base name and table name variant so
+    # each column needs a few dictionary probes instead of a scan of every table
+    pk_index, base_index, variant_index = _build_reference_index(reference_keys)
+    
     # Infer relationships for each table
     for table in tables:
         table_name = table['name']
@@ -52,22 +63,26 @@ def infer_relationships(schema: Dict[str, Any]) -> Dict[str, Any]:
                 continue  # Skip primary key columns
                 
             column_name = column['name']
+            column_lower = column_name.lower()
+            column_base = _extract_base_name(column_lower)
             
-            # Try to match column to other tables' primary keys
-            for ref_table_name, ref_pk in table_primary_keys.items():
-                if ref_table_name == table_name:
-                    continue  # Don't reference self
-                    
-                if ref_pk and _is_foreign_key_match(column_name, ref_pk, ref_table_name):
-                    confidence = _calculate_confidence(column_name, ref_pk, ref_table_name)
-                    
-                    foreign_key = {
-                        'column': column_name,
-                        'references': f'{ref_table_name}.{ref_pk}',
-                        'confidence': confidence
-                    }
-                    relationships[table_name]['foreign_keys'].append(foreign_key)
-                    break  # Take the first (best) match
+            candidates = [_first_other(pk_index.get(column_lower), reference_keys, table_name)]
+            if column_base:
+                candidates.append(_first_other(base_index.get(column_base), reference_keys, table_name))
+                candidates.append(_first_other(variant_index.get(column_base), reference_keys, table_name))
+            
+            # Take the first (best) match in table order
+            matches = [position for position in candidates if position is not None]
+            if not matches:
+                continue
+            
+            ref_table_name, ref_pk, ref_pk_lower, ref_base, table_variants = reference_keys[min(matches)]
+            foreign_key = {
+                'column': column_name,
+                'references': f'{ref_table_name}.{ref_pk}',
+                'confidence': _match_confidence(column_lower, column_base, ref_pk_lower, ref_base, table_variants)
+            }
+            relationships[table_name]['foreign_keys'].append(foreign_key)
     
     return relationships
 
@@ -80,43 +95,71 @@ def _find_primary_key(table: Dict[str, Any]) -> str:
     return None
 
 
-def _is_foreign_key_match(column_name: str, ref_pk: str, ref_table_name: str) -> bool:
+def _normalize_reference(ref_pk: str, ref_table_name: str) -> Tuple[str, str, FrozenSet[str]]:
+    """Precompute the lowercased primary key, its base name and the table name variants."""
+    ref_pk_lower = ref_pk.lower()
+    return (
+        ref_pk_lower,
+        _extract_base_name(ref_pk_lower),
+        frozenset(_get_table_name_variants(ref_table_name.lower()))
+    )
+
+
+def _build_reference_index(reference_keys: List[Tuple]) -> Tuple[Dict[str, List[int]], ...]:
     """
-    Determine if a column might be a foreign key to a reference table's primary key.
+    Map primary keys, base names and table name variants to reference positions.
+    
+    Returns:
+        Tuple of (pk_index, base_index, variant_index), each listing positions
+        into reference_keys in ascending order
+    """
+    pk_index: Dict[str, List[int]] = {}
+    base_index: Dict[str, List[int]] = {}
+    variant_index: Dict[str, List[int]] = {}
+    for position, (_, _, ref_pk_lower, ref_base, table_variants) in enumerate(reference_keys):
+        pk_index.setdefault(ref_pk_lower, []).append(position)
+        base_index.setdefault(ref_base, []).append(position)
+        for variant in table_variants:
+            variant_index.setdefault(variant, []).append(position)
+    return pk_index, base_index, variant_index
+
+
+def _first_other(positions: Optional[List[int]], reference_keys: List[Tuple], table_name: str) -> Optional[int]:
+    """Return the first indexed reference that does not belong to table_name."""
+    for position in positions or ():
+        if reference_keys[position][0] != table_name:
+            return position  # Don't reference self
+    return None
+
+
+def _match_confidence(column_lower: str, column_base: str, ref_pk_lower: str,
+                      ref_base: str, table_variants: FrozenSet[str]) -> float:
+    """
+    Score a column as a foreign key to a reference table's primary key.
+    
+    The reference must already have been matched through the reference index,
+    so the column equals its primary key, shares its base name or names one of
+    its table name variants.
     
     Common patterns:
     - customer_id -> customers.customer_id
     - user_id -> users.user_id  
     - category_id -> categories.category_id
     - profile_id -> user_profiles.profile_id
-    """
-    column_lower = column_name.lower()
-    ref_pk_lower = ref_pk.lower()
-    ref_table_lower = ref_table_name.lower()
-    
-    # Exact match
-    if column_lower == ref_pk_lower:
-        return True
     
-    # Column name matches primary key name
+    Returns:
+        Confidence score (0.0 to 1.0)
+    """
+    # Exact match = highest confidence
     if column_lower == ref_pk_lower:
-        return True
-        
-    # Try to extract the base name from both
-    column_base = _extract_base_name(column_lower)
-    ref_base = _extract_base_name(ref_pk_lower)
-    
-    # Check if column base matches reference base
-    if column_base and ref_base and column_base == ref_base:
-        return True
+        return 1.0
     
-    # Check if column base matches table name (singular/plural variants)
-    if column_base:
-        table_variants = _get_table_name_variants(ref_table_lower)
-        if column_base in table_variants:
-            return True
+    # Column base matches ref pk base
+    if column_base and column_base == ref_base:
+        return 0.95
     
-    return False
+    # Column base matches table name (singular/plural variants)
+    return 0.9
 
 
 def _extract_base_name(name: str) -> str:
@@ -152,35 +195,3 @@ def _get_table_name_variants(table_name: str) -> List[str]:
         variants.append(plural)
     
     return list(set(variants))  # Remove duplicates
-
-
-def _calculate_confidence(column_name: str, ref_pk: str, ref_table_name: str) -> float:
-    """Calculate confidence score for a foreign key relationship (0.0 to 1.0)."""
-    column_lower = column_name.lower()
-    ref_pk_lower = ref_pk.lower()
-    ref_table_lower = ref_table_name.lower()
-    
-    # Exact match = highest confidence
-    if column_lower == ref_pk_lower:
-        return 1.0
-    
-    # Column base matches ref pk base
-    column_base = _extract_base_name(column_lower)
-    ref_base = _extract_base_name(ref_pk_lower)
-    
-    if column_base == ref_base and column_base:
-        return 0.95
-    
-    # Column base matches table name variants
-    if column_base:
-        table_variants = _get_table_name_variants(ref_table_lower)
-        if column_base in table_variants:
-            return 0.9
-    
-    # Partial matches get lower confidence
-    if column_base and ref_base:
-        if column_base in ref_base or ref_base in column_base:
-            return 0.7
-    
-    # Default confidence for any match that made it this far
-    return 0.5 
\ No newline at end of file
@@ -55,8 +55,9 @@ setup(
     python_requires=">=3.8",
     install_requires=requirements,
     extras_require={
-        "dev": ["pytest", "black", "flake8", "mypy"],
-        "test": ["pytest", "pytest-cov"],
+        "dev": ["pytest", "pytest-benchmark", "pytest-mock", "pytest-xdist", "black", "flake8", "mypy"],
+        "test": ["pytest", "pytest-benchmark", "pytest-cov", "pytest-mock", "pytest-xdist"],
+        "fast": ["orjson"],
     },
     entry_points={
         "console_scripts": [
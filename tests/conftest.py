@@ -2,80 +2,159 @@
 Pytest configuration and shared fixtures for Schema Graph Builder tests
 """
 
+import builtins
+import copy
 import pytest
-import tempfile
 import os
 import yaml
 from unittest.mock import Mock, MagicMock
-import sys
+from types import MappingProxyType, SimpleNamespace
+import networkx as nx
+from pyvis.network import Network
 
-# Add the parent directory to the path so we can import our modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from schema_graph_builder import api as _api_module
+from schema_graph_builder.graph import graph_builder
+from tests.helpers import SafeDumper
+
+# Sample database schema shared by the sample_schema fixture
+_SAMPLE_SCHEMA = {
+    'database': 'testdb',
+    'tables': [
+        {
+            'name': 'customers',
+            'columns': [
+                {'name': 'customer_id', 'type': 'INTEGER', 'nullable': False, 'primary_key': True},
+                {'name': 'name', 'type': 'VARCHAR(100)', 'nullable': False, 'primary_key': False},
+                {'name': 'email', 'type': 'VARCHAR(255)', 'nullable': True, 'primary_key': False}
+            ]
+        },
+        {
+            'name': 'orders',
+            'columns': [
+                {'name': 'order_id', 'type': 'INTEGER', 'nullable': False, 'primary_key': True},
+                {'name': 'customer_id', 'type': 'INTEGER', 'nullable': False, 'primary_key': False},
+                {'name': 'order_date', 'type': 'TIMESTAMP', 'nullable': False, 'primary_key': False},
+                {'name': 'total', 'type': 'DECIMAL(10,2)', 'nullable': True, 'primary_key': False}
+            ]
+        },
+        {
+            'name': 'products',
+            'columns': [
+                {'name': 'product_id', 'type': 'INTEGER', 'nullable': False, 'primary_key': True},
+                {'name': 'name', 'type': 'VARCHAR(100)', 'nullable': False, 'primary_key': False},
+                {'name': 'price', 'type': 'DECIMAL(8,2)', 'nullable': False, 'primary_key': False}
+            ]
+        }
+    ]
+}
+
+# Relationship inference results shared by the sample_relationships fixtures
+_SAMPLE_RELATIONSHIPS = {
+    'customers': {
+        'primary_key': 'customer_id',
+        'foreign_keys': []
+    },
+    'orders': {
+        'primary_key': 'order_id',
+        'foreign_keys': [
+            {
+                'column': 'customer_id',
+                'references': 'customers.customer_id',
+                'confidence': 0.9
+            }
+        ]
+    },
+    'products': {
+        'primary_key': 'product_id',
+        'foreign_keys': []
+    }
+}
+
+# Oracle connection settings are constant, so keep them pre-serialized
+ORACLE_CONFIG_YAML = (
+    "host: localhost\n"
+    "port: 1521\n"
+    "service_name: XEPDB1\n"
+    "username: testuser\n"
+    "password: testpass\n"
+)
+
+
+def _write_config(tmp_path_factory, filename, port, database):
+    """Write a connection config once per session and return its path."""
+    config_data = {
+        'host': 'localhost',
+        'port': port,
+        'database': database,
+        'username': 'test',
+        'password': 'test'
+    }
+    
+    config_path = tmp_path_factory.mktemp("cfg") / filename
+    with open(config_path, 'w') as f:
+        yaml.dump(config_data, f, Dumper=SafeDumper)
+    
+    return str(config_path)
+
+
+# Pipeline steps and file writes stubbed out by the patched_api fixture, as
+# pre-resolved (owner, attribute) pairs so patching skips the dotted-path import
+_API_PIPELINE_STEPS = ('extract_schema', 'infer_relationships', 'build_graph')
+_API_PATCH_TARGETS = {
+    'yaml_dump': (_api_module.yaml, 'dump'),
+    'open': (builtins, 'open'),
+    'makedirs': (os, 'makedirs')
+}
 
 
 @pytest.fixture
 def sample_schema():
     """Fixture providing a sample database schema for testing"""
-    return {
-        'database': 'testdb',
+    return copy.deepcopy(_SAMPLE_SCHEMA)
+
+
+@pytest.fixture(scope="session")
+def large_schema():
+    """Fixture providing a read-only 100-table, 100-column schema (built once per session)"""
+    return MappingProxyType({
+        'database': 'large_db',
         'tables': [
             {
-                'name': 'customers',
+                'name': f'table_{i}',
                 'columns': [
-                    {'name': 'customer_id', 'type': 'INTEGER', 'nullable': False, 'primary_key': True},
-                    {'name': 'name', 'type': 'VARCHAR(100)', 'nullable': False, 'primary_key': False},
-                    {'name': 'email', 'type': 'VARCHAR(255)', 'nullable': True, 'primary_key': False}
-                ]
-            },
-            {
-                'name': 'orders',
-                'columns': [
-                    {'name': 'order_id', 'type': 'INTEGER', 'nullable': False, 'primary_key': True},
-                    {'name': 'customer_id', 'type': 'INTEGER', 'nullable': False, 'primary_key': False},
-                    {'name': 'order_date', 'type': 'TIMESTAMP', 'nullable': False, 'primary_key': False},
-                    {'name': 'total', 'type': 'DECIMAL(10,2)', 'nullable': True, 'primary_key': False}
-                ]
-            },
-            {
-                'name': 'products',
-                'columns': [
-                    {'name': 'product_id', 'type': 'INTEGER', 'nullable': False, 'primary_key': True},
-                    {'name': 'name', 'type': 'VARCHAR(100)', 'nullable': False, 'primary_key': False},
-                    {'name': 'price', 'type': 'DECIMAL(8,2)', 'nullable': False, 'primary_key': False}
+                    {'name': f'col_{j}', 'type': 'VARCHAR(100)', 'nullable': True, 'primary_key': j == 0}
+                    for j in range(100)  # 100 columns per table
                 ]
             }
+            for i in range(100)  # 100 tables
         ]
-    }
+    })
 
 
 @pytest.fixture
 def sample_relationships():
     """Fixture providing sample relationship inference results"""
-    return {
-        'customers': {
-            'primary_key': 'customer_id',
-            'foreign_keys': []
-        },
-        'orders': {
-            'primary_key': 'order_id',
-            'foreign_keys': [
-                {
-                    'column': 'customer_id',
-                    'references': 'customers.customer_id',
-                    'confidence': 0.9
-                }
-            ]
-        },
-        'products': {
-            'primary_key': 'product_id',
-            'foreign_keys': []
-        }
-    }
+    return copy.deepcopy(_SAMPLE_RELATIONSHIPS)
 
 
-@pytest.fixture
-def temp_config_file():
-    """Fixture providing a temporary configuration file"""
+@pytest.fixture(scope="session")
+def sample_relationships_yaml(tmp_path_factory):
+    """Fixture providing the sample relationships as a YAML file (written once per session)"""
+    rels_path = tmp_path_factory.mktemp("cfg") / "rels.yaml"
+    rels_path.write_text(yaml.dump(_SAMPLE_RELATIONSHIPS, Dumper=SafeDumper))
+    
+    return str(rels_path)
+
+
+@pytest.fixture(scope="session")
+def fake_config_path():
+    """Fixture providing a config path for tests where the file is never read"""
+    return "dummy_config.yaml"
+
+
+@pytest.fixture(scope="session")
+def temp_config_file(tmp_path_factory):
+    """Fixture providing a temporary configuration file (written once per session)"""
     config_data = {
         'host': 'localhost',
         'port': 5432,
@@ -84,69 +163,129 @@ def temp_config_file():
         'password': 'testpass'
     }
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        yaml.dump(config_data, f)
-        temp_file = f.name
+    config_path = tmp_path_factory.mktemp("cfg") / "db.yaml"
+    with open(config_path, 'w') as f:
+        yaml.dump(config_data, f, Dumper=SafeDumper)
     
-    yield temp_file
+    return str(config_path)
+
+
+@pytest.fixture(scope="session")
+def oracle_config_file(tmp_path_factory):
+    """Fixture providing a temporary Oracle configuration file (written once per session)"""
+    config_path = tmp_path_factory.mktemp("cfg") / "oracle.yaml"
+    config_path.write_text(ORACLE_CONFIG_YAML)
     
-    # Cleanup
-    if os.path.exists(temp_file):
-        os.unlink(temp_file)
+    return str(config_path)
 
 
-@pytest.fixture
-def temp_output_dir():
-    """Fixture providing a temporary output directory"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield temp_dir
+@pytest.fixture(scope="session")
+def postgres_config_path(tmp_path_factory):
+    """Fixture providing a PostgreSQL configuration file (written once per session)"""
+    return _write_config(tmp_path_factory, "postgres.yaml", 5432, 'test_db')
+
+
+@pytest.fixture(scope="session")
+def mysql_config_path(tmp_path_factory):
+    """Fixture providing a MySQL configuration file (written once per session)"""
+    return _write_config(tmp_path_factory, "mysql.yaml", 3306, 'mysql_test')
+
+
+@pytest.fixture(scope="session")
+def mssql_config_path(tmp_path_factory):
+    """Fixture providing an MS SQL Server configuration file (written once per session)"""
+    return _write_config(tmp_path_factory, "mssql.yaml", 1433, 'mssql_test')
+
+
+@pytest.fixture(scope="session")
+def pipeline_config_paths(postgres_config_path, mysql_config_path, mssql_config_path):
+    """Fixture mapping database types to their configuration files"""
+    return {
+        'postgres': postgres_config_path,
+        'mysql': mysql_config_path,
+        'mssql': mssql_config_path
+    }
 
 
 @pytest.fixture
+def temp_output_dir(tmp_path):
+    """Fixture providing a temporary output directory (unique per test, so safe across xdist workers)"""
+    return str(tmp_path)
+
+
+def _mock_get_columns(table_name, schema=None):
+    """Column details returned by the mock inspector"""
+    columns_map = {
+        'customers': [
+            {'name': 'customer_id', 'type': Mock(), 'nullable': False, 'primary_key': 1},
+            {'name': 'name', 'type': Mock(), 'nullable': False, 'primary_key': 0},
+            {'name': 'email', 'type': Mock(), 'nullable': True, 'primary_key': 0}
+        ],
+        'orders': [
+            {'name': 'order_id', 'type': Mock(), 'nullable': False, 'primary_key': 1},
+            {'name': 'customer_id', 'type': Mock(), 'nullable': False, 'primary_key': 0},
+            {'name': 'order_date', 'type': Mock(), 'nullable': False, 'primary_key': 0},
+            {'name': 'total', 'type': Mock(), 'nullable': True, 'primary_key': 0}
+        ],
+        'products': [
+            {'name': 'product_id', 'type': Mock(), 'nullable': False, 'primary_key': 1},
+            {'name': 'name', 'type': Mock(), 'nullable': False, 'primary_key': 0},
+            {'name': 'price', 'type': Mock(), 'nullable': False, 'primary_key': 0}
+        ]
+    }
+    return columns_map.get(table_name, [])
+
+
+def _mock_get_pk_constraint(table_name, schema=None):
+    """Primary key constraints returned by the mock inspector"""
+    pk_map = {
+        'customers': {'constrained_columns': ['customer_id']},
+        'orders': {'constrained_columns': ['order_id']},
+        'products': {'constrained_columns': ['product_id']}
+    }
+    return pk_map.get(table_name, {'constrained_columns': []})
+
+
+def _configure_mock_inspector(mock_inspector):
+    """Apply the default table/column/primary key behaviour to a mock inspector"""
+    mock_inspector.get_table_names.return_value = ['customers', 'orders', 'products']
+    mock_inspector.get_columns.side_effect = _mock_get_columns
+    mock_inspector.get_pk_constraint.side_effect = _mock_get_pk_constraint
+
+
+@pytest.fixture(scope="session")
 def mock_sqlalchemy_engine():
-    """Fixture providing a mock SQLAlchemy engine"""
+    """Fixture providing a mock SQLAlchemy engine (built once per session)"""
     mock_engine = Mock()
     mock_inspector = Mock()
+    _configure_mock_inspector(mock_inspector)
     
-    # Mock table names
-    mock_inspector.get_table_names.return_value = ['customers', 'orders', 'products']
-    
-    # Mock column details
-    def mock_get_columns(table_name):
-        columns_map = {
-            'customers': [
-                {'name': 'customer_id', 'type': Mock(), 'nullable': False, 'primary_key': 1},
-                {'name': 'name', 'type': Mock(), 'nullable': False, 'primary_key': 0},
-                {'name': 'email', 'type': Mock(), 'nullable': True, 'primary_key': 0}
-            ],
-            'orders': [
-                {'name': 'order_id', 'type': Mock(), 'nullable': False, 'primary_key': 1},
-                {'name': 'customer_id', 'type': Mock(), 'nullable': False, 'primary_key': 0},
-                {'name': 'order_date', 'type': Mock(), 'nullable': False, 'primary_key': 0},
-                {'name': 'total', 'type': Mock(), 'nullable': True, 'primary_key': 0}
-            ],
-            'products': [
-                {'name': 'product_id', 'type': Mock(), 'nullable': False, 'primary_key': 1},
-                {'name': 'name', 'type': Mock(), 'nullable': False, 'primary_key': 0},
-                {'name': 'price', 'type': Mock(), 'nullable': False, 'primary_key': 0}
-            ]
-        }
-        return columns_map.get(table_name, [])
-    
-    mock_inspector.get_columns.side_effect = mock_get_columns
-    
-    # Mock primary keys
-    def mock_get_pk_constraint(table_name):
-        pk_map = {
-            'customers': {'constrained_columns': ['customer_id']},
-            'orders': {'constrained_columns': ['order_id']},
-            'products': {'constrained_columns': ['product_id']}
-        }
-        return pk_map.get(table_name, {'constrained_columns': []})
+    return mock_engine, mock_inspector
+
+
+@pytest.fixture
+def db_mock_context(mock_sqlalchemy_engine):
+    """Fixture wiring a mock connection into the engine's connect() context manager"""
+    mock_engine, mock_inspector = mock_sqlalchemy_engine
+    mock_connection = Mock()
+    mock_engine.connect.return_value.configure_mock(
+        __enter__=Mock(return_value=mock_connection),
+        __exit__=Mock(return_value=None)
+    )
     
-    mock_inspector.get_pk_constraint.side_effect = mock_get_pk_constraint
+    return mock_engine, mock_inspector, mock_connection
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_sqlalchemy_engine(request):
+    """Restore the shared mock engine/inspector to their defaults after each test using them"""
+    yield
     
-    return mock_engine, mock_inspector
+    if 'mock_sqlalchemy_engine' in request.fixturenames:
+        mock_engine, mock_inspector = request.getfixturevalue('mock_sqlalchemy_engine')
+        mock_engine.reset_mock(return_value=True, side_effect=True)
+        mock_inspector.reset_mock(return_value=True, side_effect=True)
+        _configure_mock_inspector(mock_inspector)
 
 
 @pytest.fixture
@@ -158,6 +297,69 @@ def mock_networkx_graph():
     return mock_graph
 
 
+@pytest.fixture
+def patched_graph_builder(monkeypatch):
+    """
+    Fixture patching NetworkX and pyvis access in the graph builder at once.
+    
+    Relationship files are read for real; tests adjust the returned mocks
+    (e.g. graph.nodes, net.show.side_effect) as needed.
+    """
+    mocks = SimpleNamespace(
+        graph=Mock(spec=nx.DiGraph),
+        net=Mock(spec=Network),
+        node_link=Mock(return_value={'nodes': [], 'links': []})
+    )
+    mocks.graph.nodes.return_value = []
+    mocks.graph.edges.return_value = []
+    mocks.digraph = Mock(return_value=mocks.graph)
+    mocks.network = Mock(return_value=mocks.net)
+    
+    monkeypatch.setattr(graph_builder.nx, 'DiGraph', mocks.digraph)
+    monkeypatch.setattr(graph_builder, 'Network', mocks.network)
+    monkeypatch.setattr(graph_builder.nx.readwrite.json_graph, 'node_link_data', mocks.node_link)
+    
+    return mocks
+
+
+@pytest.fixture(scope="module")
+def api_mocks():
+    """Fixture providing the SchemaGraphBuilder pipeline mocks (built once per module)"""
+    mocks = SimpleNamespace(**{name: Mock() for name in _API_PIPELINE_STEPS + tuple(_API_PATCH_TARGETS)})
+    
+    # Only open() is used as a context manager, so only it needs magic methods
+    mocks.open = MagicMock()
+    
+    return mocks
+
+
+@pytest.fixture
+def patched_api(mocker, api_mocks):
+    """
+    Fixture patching the pipeline steps and file writes used by SchemaGraphBuilder.
+    
+    The shared mocks are reset before each test and only patched in for its
+    duration, so tests that exercise the real pipeline are unaffected.
+    """
+    for mock in vars(api_mocks).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    
+    mocker.patch.multiple(
+        _api_module,
+        **{name: getattr(api_mocks, name) for name in _API_PIPELINE_STEPS}
+    )
+    for name, (owner, attribute) in _API_PATCH_TARGETS.items():
+        mocker.patch.object(owner, attribute, getattr(api_mocks, name))
+    
+    return api_mocks
+
+
+@pytest.fixture
+def builder(patched_api):
+    """Fixture providing a fresh SchemaGraphBuilder wrapping the patched pipeline"""
+    return _api_module.SchemaGraphBuilder()
+
+
 @pytest.fixture
 def sample_config_data():
     """Fixture providing sample configuration data"""
@@ -0,0 +1,9 @@
+"""
+Shared helpers for Schema Graph Builder tests
+"""
+
+import yaml
+
+# libyaml-backed YAML loader and dumper when PyYAML was built with it
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
@@ -2,129 +2,100 @@
 Tests for schema extractor module
 """
 
+import re
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import Mock
+from schema_graph_builder.connectors import base_connector
+from schema_graph_builder.extractor import schema_extractor
 from schema_graph_builder.extractor.schema_extractor import extract_schema, get_supported_database_types
 
+# Built-in connector registry, captured once at import
+SUPPORTED_TYPES = get_supported_database_types()
+
+# Expected error messages, compiled once for pytest.raises(match=...)
+_UNSUPPORTED_NOSQL = re.compile(r"Unsupported database type: 'nosql'")
+_UNSUPPORTED_EMPTY = re.compile(r"Unsupported database type: ''\. Supported types:")
+_CONNECTION_FAILED = re.compile(r"Database connection failed")
+
+# Mixed-case spellings of the PostgreSQL type and alias
+CASE_VARIANTS = ['POSTGRES', 'Postgres', 'PostgreSQL', 'POSTGRESQL']
+
+
+@pytest.fixture(autouse=True)
+def _patch_connector(monkeypatch, sample_schema):
+    """Stub out connection and extraction on every connector for all tests in this module"""
+    monkeypatch.setattr(base_connector.DatabaseConnector, '_create_connection', lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(base_connector.DatabaseConnector, '_extract_schema_data', lambda self, *args, **kwargs: sample_schema)
+
+
+@pytest.fixture
+def make_connector_mock(sample_schema):
+    """Factory fixture building a pre-wired connector mock"""
+    def _make(return_value=None, side_effect=None):
+        connector = Mock()
+        connector.extract_schema.return_value = sample_schema if return_value is None else return_value
+        if side_effect is not None:
+            connector.extract_schema.side_effect = side_effect
+        return connector
+    
+    return _make
+
 
 class TestSchemaExtractor:
     """Tests for the schema extractor"""
     
-    def test_extract_schema_postgres(self, sample_schema, temp_config_file):
-        """Test schema extraction for PostgreSQL"""
-        with patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._create_connection'), \
-             patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._extract_schema_data', return_value=sample_schema):
-            
-            result = extract_schema('postgres', temp_config_file)
-            
-            assert result == sample_schema
-            assert result['database'] == 'testdb'
-            assert len(result['tables']) == 3
-    
-    def test_extract_schema_postgresql_alias(self, sample_schema, temp_config_file):
-        """Test schema extraction using 'postgresql' alias"""
-        with patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._create_connection'), \
-             patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._extract_schema_data', return_value=sample_schema):
-            
-            result = extract_schema('postgresql', temp_config_file)
-            
-            assert result == sample_schema
-    
-    def test_extract_schema_mysql(self, sample_schema, temp_config_file):
-        """Test schema extraction for MySQL"""
-        with patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._create_connection'), \
-             patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._extract_schema_data', return_value=sample_schema):
-            
-            result = extract_schema('mysql', temp_config_file)
-            
-            assert result == sample_schema
-    
-    def test_extract_schema_mssql(self, sample_schema, temp_config_file):
-        """Test schema extraction for MS SQL Server"""
-        with patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._create_connection'), \
-             patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._extract_schema_data', return_value=sample_schema):
-            
-            result = extract_schema('mssql', temp_config_file)
-            
-            assert result == sample_schema
-    
-    def test_extract_schema_sqlserver_alias(self, sample_schema, temp_config_file):
-        """Test schema extraction using 'sqlserver' alias"""
-        with patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._create_connection'), \
-             patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._extract_schema_data', return_value=sample_schema):
-            
-            result = extract_schema('sqlserver', temp_config_file)
-            
-            assert result == sample_schema
+    @pytest.mark.parametrize("db_type", ['postgres', 'postgresql', 'mysql', 'mssql', 'sqlserver'])
+    def test_extract_schema(self, db_type, sample_schema, temp_config_file):
+        """Test schema extraction for each supported type and alias"""
+        result = extract_schema(db_type, temp_config_file)
+        
+        assert result == sample_schema
+        assert result['database'] == 'testdb'
+        assert len(result['tables']) == 3
     
-    def test_extract_schema_oracle(self, sample_schema, temp_config_file):
+    def test_extract_schema_oracle(self, sample_schema, oracle_config_file):
         """Test schema extraction for Oracle"""
-        # Create a proper Oracle config for testing
-        oracle_config = {
-            'host': 'localhost',
-            'port': 1521,
-            'service_name': 'XEPDB1',
-            'username': 'testuser',
-            'password': 'testpass'
-        }
-        
-        import tempfile
-        import yaml
-        import os
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(oracle_config, f)
-            oracle_config_file = f.name
+        result = extract_schema('oracle', oracle_config_file)
         
-        try:
-            with patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._create_connection'), \
-                 patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._extract_schema_data', return_value=sample_schema):
-                
-                result = extract_schema('oracle', oracle_config_file)
-                
-                assert result == sample_schema
-        finally:
-            os.unlink(oracle_config_file)
+        assert result == sample_schema
     
-    def test_extract_schema_unsupported_db_type(self, temp_config_file):
+    def test_extract_schema_unsupported_db_type(self, fake_config_path):
         """Test schema extraction with unsupported database type"""
-        with pytest.raises(ValueError, match="Unsupported database type: 'nosql'"):
-            extract_schema('nosql', temp_config_file)
+        with pytest.raises(ValueError, match=_UNSUPPORTED_NOSQL):
+            extract_schema('nosql', fake_config_path)
     
-    def test_extract_schema_case_insensitive(self, temp_config_file):
+    @pytest.mark.parametrize("db_type", CASE_VARIANTS)
+    def test_extract_schema_case_insensitive(self, db_type, fake_config_path, monkeypatch, make_connector_mock):
         """Test that database type matching is case insensitive"""
-        with patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._create_connection'), \
-             patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._extract_schema_data', return_value={'database': 'test', 'tables': []}):
-            
-            # Test various case combinations
-            for db_type in ['POSTGRES', 'Postgres', 'PostgreSQL', 'POSTGRESQL']:
-                result = extract_schema(db_type, temp_config_file)
-                assert result['database'] == 'test'
+        mock_connector = make_connector_mock(return_value={'database': 'test', 'tables': []})
+        monkeypatch.setitem(schema_extractor.DATABASE_CONNECTORS, 'postgres', Mock(return_value=mock_connector))
+        monkeypatch.setitem(schema_extractor.DATABASE_CONNECTORS, 'postgresql', Mock(return_value=mock_connector))
+        
+        result = extract_schema(db_type, fake_config_path)
+        
+        assert result['database'] == 'test'
     
-    def test_extract_schema_connector_exception(self, temp_config_file):
+    def test_extract_schema_connector_exception(self, fake_config_path, monkeypatch, make_connector_mock):
         """Test handling of exceptions from connectors"""
-        with patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._create_connection'), \
-             patch('schema_graph_builder.connectors.base_connector.DatabaseConnector._extract_schema_data', side_effect=Exception("Database connection failed")):
-            
-            with pytest.raises(Exception, match="Database connection failed"):
-                extract_schema('postgres', temp_config_file)
+        mock_connector = make_connector_mock(side_effect=Exception("Database connection failed"))
+        monkeypatch.setitem(schema_extractor.DATABASE_CONNECTORS, 'postgres', Mock(return_value=mock_connector))
+        
+        with pytest.raises(Exception, match=_CONNECTION_FAILED):
+            extract_schema('postgres', fake_config_path)
     
     def test_extract_schema_supported_databases_list(self):
         """Test that the function supports all expected database types"""
-        # Use the new get_supported_database_types function
-        supported_types = get_supported_database_types()
-        
         # Ensure we have the expected types including Oracle
         expected_types = ['postgres', 'postgresql', 'mysql', 'mssql', 'sqlserver', 'oracle']
         for db_type in expected_types:
-            assert db_type in supported_types, f"Database type '{db_type}' should be supported"
+            assert db_type in SUPPORTED_TYPES, f"Database type '{db_type}' should be supported"
     
-    def test_extract_schema_empty_string_db_type(self, temp_config_file):
+    def test_extract_schema_empty_string_db_type(self, fake_config_path):
         """Test schema extraction with empty database type"""
-        with pytest.raises(ValueError, match="Unsupported database type: ''. Supported types:"):
-            extract_schema('', temp_config_file)
+        with pytest.raises(ValueError, match=_UNSUPPORTED_EMPTY):
+            extract_schema('', fake_config_path)
     
-    def test_extract_schema_none_db_type(self, temp_config_file):
+    def test_extract_schema_none_db_type(self, fake_config_path):
         """Test schema extraction with None database type"""
         with pytest.raises(AttributeError):
-            extract_schema(None, temp_config_file) 
\ No newline at end of file
+            extract_schema(None, fake_config_path) 
\ No newline at end of file
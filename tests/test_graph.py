@@ -7,87 +7,60 @@ import tempfile
 import json
 import os
 import yaml
-from unittest.mock import patch, Mock, mock_open
-from schema_graph_builder.graph.graph_builder import build_graph, _create_fallback_html
+from unittest.mock import patch
+from schema_graph_builder.graph import graph_builder
+from schema_graph_builder.graph.graph_builder import build_graph, _create_fallback_html, _write_json
+from tests.helpers import SafeDumper
+
+
+@pytest.fixture(autouse=True)
+def _clear_yaml_cache():
+    """Start every test with an empty relationships cache"""
+    graph_builder._YAML_CACHE.clear()
+    yield
+    graph_builder._YAML_CACHE.clear()
 
 
 class TestGraphBuilder:
     """Tests for graph building functionality"""
     
-    @patch('schema_graph_builder.graph.graph_builder.nx.DiGraph')
-    @patch('schema_graph_builder.graph.graph_builder.yaml.safe_load')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_build_graph_basic(self, mock_file, mock_yaml, mock_digraph, sample_schema, sample_relationships, temp_output_dir):
+    def test_build_graph_basic(self, patched_graph_builder, sample_schema, sample_relationships_yaml, temp_output_dir):
         """Test basic graph building functionality"""
-        mock_yaml.return_value = sample_relationships
-        mock_graph = Mock()
-        mock_digraph.return_value = mock_graph
+        output_path = os.path.join(temp_output_dir, 'test_graph.json')
+        build_graph(sample_schema, sample_relationships_yaml, visualize=False, output_json_path=output_path)
         
-        # Mock NetworkX operations
-        mock_graph.add_node = Mock()
-        mock_graph.add_edge = Mock()
+        # Verify graph nodes were added
+        assert patched_graph_builder.graph.add_node.call_count == 3  # 3 tables
         
-        with patch('schema_graph_builder.graph.graph_builder.nx.readwrite.json_graph.node_link_data') as mock_node_link:
-            mock_node_link.return_value = {'nodes': [], 'links': []}
-            
-            output_path = os.path.join(temp_output_dir, 'test_graph.json')
-            build_graph(sample_schema, 'dummy_config.yaml', visualize=False, output_json_path=output_path)
-            
-            # Verify graph nodes were added
-            assert mock_graph.add_node.call_count == 3  # 3 tables
-            
-            # Verify graph edges were added
-            mock_graph.add_edge.assert_called()
-    
-    @patch('schema_graph_builder.graph.graph_builder.Network')
-    @patch('schema_graph_builder.graph.graph_builder.nx.DiGraph')
-    @patch('schema_graph_builder.graph.graph_builder.yaml.safe_load')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_build_graph_with_visualization(self, mock_file, mock_yaml, mock_digraph, mock_network, sample_schema, sample_relationships):
+        # Verify graph edges were added
+        patched_graph_builder.graph.add_edge.assert_called()
+    
+    def test_build_graph_with_visualization(self, patched_graph_builder, sample_schema, sample_relationships_yaml, temp_output_dir):
         """Test graph building with visualization"""
-        mock_yaml.return_value = sample_relationships
-        mock_graph = Mock()
-        mock_digraph.return_value = mock_graph
-        mock_graph.nodes.return_value = ['customers', 'orders', 'products']
-        mock_graph.edges.return_value = [('orders', 'customers', {'label': 'customer_id'})]
-        
-        mock_net = Mock()
-        mock_network.return_value = mock_net
-        mock_net.show = Mock()
-        
-        with patch('schema_graph_builder.graph.graph_builder.nx.readwrite.json_graph.node_link_data') as mock_node_link:
-            mock_node_link.return_value = {'nodes': [], 'links': []}
-            
-            build_graph(sample_schema, 'dummy_config.yaml', visualize=True)
-            
-            # Verify visualization was created
-            mock_network.assert_called_once()
-            mock_net.add_node.assert_called()
-            mock_net.add_edge.assert_called()
-            mock_net.show.assert_called_once()
-    
-    @patch('schema_graph_builder.graph.graph_builder.Network')
-    @patch('schema_graph_builder.graph.graph_builder.nx.DiGraph')
-    @patch('schema_graph_builder.graph.graph_builder.yaml.safe_load')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_build_graph_pyvis_fallback(self, mock_file, mock_yaml, mock_digraph, mock_network, sample_schema, sample_relationships):
+        patched_graph_builder.graph.nodes.return_value = ['customers', 'orders', 'products']
+        patched_graph_builder.graph.edges.return_value = [('orders', 'customers', {'label': 'customer_id'})]
+        
+        output_path = os.path.join(temp_output_dir, 'schema_graph.json')
+        build_graph(sample_schema, sample_relationships_yaml, visualize=True, output_json_path=output_path)
+        
+        # Verify visualization was created
+        mock_net = patched_graph_builder.net
+        patched_graph_builder.network.assert_called_once()
+        mock_net.add_node.assert_called()
+        mock_net.add_edge.assert_called()
+        mock_net.show.assert_called_once()
+    
+    def test_build_graph_pyvis_fallback(self, patched_graph_builder, sample_schema, sample_relationships_yaml, temp_output_dir):
         """Test fallback when pyvis fails"""
-        mock_yaml.return_value = sample_relationships
-        mock_graph = Mock()
-        mock_digraph.return_value = mock_graph
-        mock_graph.nodes.return_value = ['customers', 'orders', 'products']
-        mock_graph.edges.return_value = [('orders', 'customers', {'label': 'customer_id'})]
-        
-        mock_net = Mock()
-        mock_network.return_value = mock_net
+        patched_graph_builder.graph.nodes.return_value = ['customers', 'orders', 'products']
+        patched_graph_builder.graph.edges.return_value = [('orders', 'customers', {'label': 'customer_id'})]
+        
         # Simulate pyvis failure
-        mock_net.show.side_effect = AttributeError("'NoneType' object has no attribute 'render'")
+        patched_graph_builder.net.show.side_effect = AttributeError("'NoneType' object has no attribute 'render'")
         
-        with patch('schema_graph_builder.graph.graph_builder.nx.readwrite.json_graph.node_link_data') as mock_node_link, \
-             patch('schema_graph_builder.graph.graph_builder._create_fallback_html') as mock_fallback:
-            mock_node_link.return_value = {'nodes': [], 'links': []}
-            
-            build_graph(sample_schema, 'dummy_config.yaml', visualize=True)
+        with patch('schema_graph_builder.graph.graph_builder._create_fallback_html') as mock_fallback:
+            output_path = os.path.join(temp_output_dir, 'schema_graph.json')
+            build_graph(sample_schema, sample_relationships_yaml, visualize=True, output_json_path=output_path)
             
             # Verify fallback was called
             mock_fallback.assert_called_once()
@@ -108,111 +81,161 @@ class TestGraphBuilder:
             assert 'vis.Network' in content
             assert 'Database Schema Relationships' in content
     
-    @patch('schema_graph_builder.graph.graph_builder.yaml.safe_load')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_build_graph_invalid_config(self, mock_file, mock_yaml, sample_schema):
+    def test_create_fallback_html_without_orjson(self, mock_networkx_graph, temp_output_dir, monkeypatch):
+        """Test fallback HTML embeds the same node data with the stdlib JSON serializer"""
+        monkeypatch.setattr(graph_builder, 'ORJSON_AVAILABLE', False)
+        output_file = os.path.join(temp_output_dir, 'test_fallback.html')
+        
+        _create_fallback_html(mock_networkx_graph, output_file)
+        
+        with open(output_file, 'r') as f:
+            content = f.read()
+            assert '{"id": 0, "label": "customers", "title": "Table: customers"}' in content
+            assert '{"from": 1, "to": 0, "label": "customer_id", "arrows": "to"}' in content
+    
+    def test_create_fallback_html_non_ascii_names(self, tmp_path):
+        """Test fallback HTML is written as UTF-8 for non-ASCII table names"""
+        G = graph_builder.nx.DiGraph()
+        G.add_edge('bestellungen', 'kunden_übersicht', label='kunde_id')
+        output_file = tmp_path / 'test_fallback.html'
+        
+        _create_fallback_html(G, str(output_file))
+        
+        assert 'Table: kunden_übersicht' in output_file.read_text(encoding='utf-8')
+    
+    def test_build_graph_invalid_config(self, patched_graph_builder, sample_schema, tmp_path):
         """Test handling of invalid configuration file"""
-        mock_yaml.side_effect = yaml.YAMLError("Invalid YAML")
+        config_path = tmp_path / 'invalid_config.yaml'
+        config_path.write_text("orders: {foreign_keys: [unclosed\n")
         
         with pytest.raises(yaml.YAMLError):
-            build_graph(sample_schema, 'invalid_config.yaml')
+            build_graph(sample_schema, str(config_path), output_json_path=str(tmp_path / 'graph.json'))
     
-    @patch('schema_graph_builder.graph.graph_builder.nx.DiGraph')
-    @patch('schema_graph_builder.graph.graph_builder.yaml.safe_load')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_build_graph_empty_relationships(self, mock_file, mock_yaml, mock_digraph, sample_schema):
+    def test_build_graph_empty_relationships(self, patched_graph_builder, sample_schema, tmp_path):
         """Test graph building with empty relationships"""
-        mock_yaml.return_value = {}
-        mock_graph = Mock()
-        mock_digraph.return_value = mock_graph
+        config_path = tmp_path / 'empty_config.yaml'
+        config_path.write_text("{}\n")
         
-        with patch('schema_graph_builder.graph.graph_builder.nx.readwrite.json_graph.node_link_data') as mock_node_link:
-            mock_node_link.return_value = {'nodes': [], 'links': []}
-            
-            build_graph(sample_schema, 'empty_config.yaml', visualize=False)
-            
-            # Should still add nodes for tables
-            assert mock_graph.add_node.call_count == 3
-            # But no edges should be added
-            mock_graph.add_edge.assert_not_called()
+        build_graph(sample_schema, str(config_path), visualize=False, output_json_path=str(tmp_path / 'graph.json'))
+        
+        # Should still add nodes for tables
+        assert patched_graph_builder.graph.add_node.call_count == 3
+        # But no edges should be added
+        patched_graph_builder.graph.add_edge.assert_not_called()
     
     def test_build_graph_file_permissions(self, sample_schema, sample_relationships):
         """Test handling of file permission errors"""
-        with patch('schema_graph_builder.graph.graph_builder.yaml.safe_load', return_value=sample_relationships), \
+        with patch('schema_graph_builder.graph.graph_builder.yaml.load', return_value=sample_relationships), \
              patch('builtins.open', side_effect=PermissionError("Permission denied")):
             
             with pytest.raises(PermissionError):
                 build_graph(sample_schema, 'restricted_config.yaml')
 
 
+class TestJSONOutput:
+    """Tests for writing graph JSON output"""
+    
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_write_json_round_trip(self, monkeypatch, temp_output_dir, use_orjson):
+        """Test that both serializers write the same indented JSON"""
+        if use_orjson and not graph_builder.ORJSON_AVAILABLE:
+            pytest.skip("orjson is not installed")
+        monkeypatch.setattr(graph_builder, 'ORJSON_AVAILABLE', use_orjson)
+        data = {'nodes': [{'id': 'orders', 'columns': 4}], 'links': [{'source': 'orders', 'target': 'customers', 'confidence': 0.9}]}
+        output_path = os.path.join(temp_output_dir, 'graph.json')
+        
+        _write_json(data, output_path)
+        
+        with open(output_path) as f:
+            content = f.read()
+        assert content == json.dumps(data, indent=2)
+    
+    @pytest.mark.performance
+    @pytest.mark.skipif(not graph_builder.ORJSON_AVAILABLE, reason="orjson is not installed")
+    def test_write_json_large_graph(self, temp_output_dir):
+        """Test writing node-link data for a 10k-edge graph"""
+        G = graph_builder.nx.DiGraph()
+        for i in range(1000):
+            G.add_node(f'table_{i}', columns=5, label=f'table_{i}')
+        for i in range(10000):
+            target = (i % 1000 + i // 1000 + 1) % 1000
+            G.add_edge(f'table_{i % 1000}', f'table_{target}', label=f'table_{target}_id', confidence=0.8)
+        assert G.number_of_edges() == 10000
+        data = graph_builder.nx.readwrite.json_graph.node_link_data(G)
+        output_path = os.path.join(temp_output_dir, 'large_graph.json')
+        
+        _write_json(data, output_path)
+        
+        with open(output_path) as f:
+            assert json.load(f) == data
+
+
 class TestGraphFilenameGeneration:
     """Tests for graph filename generation logic"""
     
-    @patch('schema_graph_builder.graph.graph_builder.nx.DiGraph')
-    @patch('schema_graph_builder.graph.graph_builder.yaml.safe_load')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('schema_graph_builder.graph.graph_builder.Network')
-    def test_mysql_filename_generation(self, mock_network, mock_file, mock_yaml, mock_digraph, sample_schema, sample_relationships):
+    def test_mysql_filename_generation(self, patched_graph_builder, sample_schema, sample_relationships_yaml, temp_output_dir):
         """Test MySQL-specific filename generation"""
-        mock_yaml.return_value = sample_relationships
-        mock_graph = Mock()
-        mock_digraph.return_value = mock_graph
-        mock_graph.nodes.return_value = []
-        mock_graph.edges.return_value = []
-        
-        mock_net = Mock()
-        mock_network.return_value = mock_net
+        output_path = os.path.join(temp_output_dir, 'mysql_schema_graph.json')
+        build_graph(sample_schema, sample_relationships_yaml, visualize=True, output_json_path=output_path)
         
-        with patch('schema_graph_builder.graph.graph_builder.nx.readwrite.json_graph.node_link_data') as mock_node_link:
-            mock_node_link.return_value = {'nodes': [], 'links': []}
-            
-            build_graph(sample_schema, 'config.yaml', visualize=True, output_json_path='output/mysql_schema_graph.json')
-            
-            # Should call show with mysql filename
-            mock_net.show.assert_called_with('mysql_schema_graph.html')
-    
-    @patch('schema_graph_builder.graph.graph_builder.nx.DiGraph')
-    @patch('schema_graph_builder.graph.graph_builder.yaml.safe_load')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('schema_graph_builder.graph.graph_builder.Network')
-    def test_postgres_filename_generation(self, mock_network, mock_file, mock_yaml, mock_digraph, sample_schema, sample_relationships):
+        # Should call show with mysql filename
+        patched_graph_builder.net.show.assert_called_with('mysql_schema_graph.html')
+    
+    def test_postgres_filename_generation(self, patched_graph_builder, sample_schema, sample_relationships_yaml, temp_output_dir):
         """Test PostgreSQL-specific filename generation"""
-        mock_yaml.return_value = sample_relationships
-        mock_graph = Mock()
-        mock_digraph.return_value = mock_graph
-        mock_graph.nodes.return_value = []
-        mock_graph.edges.return_value = []
+        output_path = os.path.join(temp_output_dir, 'postgres_schema_graph.json')
+        build_graph(sample_schema, sample_relationships_yaml, visualize=True, output_json_path=output_path)
         
-        mock_net = Mock()
-        mock_network.return_value = mock_net
-        
-        with patch('schema_graph_builder.graph.graph_builder.nx.readwrite.json_graph.node_link_data') as mock_node_link:
-            mock_node_link.return_value = {'nodes': [], 'links': []}
-            
-            build_graph(sample_schema, 'config.yaml', visualize=True, output_json_path='output/postgres_schema_graph.json')
-            
-            # Should call show with postgres filename
-            mock_net.show.assert_called_with('postgres_schema_graph.html')
-    
-    @patch('schema_graph_builder.graph.graph_builder.nx.DiGraph')
-    @patch('schema_graph_builder.graph.graph_builder.yaml.safe_load')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('schema_graph_builder.graph.graph_builder.Network')
-    def test_default_filename_generation(self, mock_network, mock_file, mock_yaml, mock_digraph, sample_schema, sample_relationships):
+        # Should call show with postgres filename
+        patched_graph_builder.net.show.assert_called_with('postgres_schema_graph.html')
+    
+    def test_default_filename_generation(self, patched_graph_builder, sample_schema, sample_relationships_yaml, temp_output_dir):
         """Test default filename generation"""
-        mock_yaml.return_value = sample_relationships
-        mock_graph = Mock()
-        mock_digraph.return_value = mock_graph
-        mock_graph.nodes.return_value = []
-        mock_graph.edges.return_value = []
+        output_path = os.path.join(temp_output_dir, 'schema_graph.json')
+        build_graph(sample_schema, sample_relationships_yaml, visualize=True, output_json_path=output_path)
         
-        mock_net = Mock()
-        mock_network.return_value = mock_net
+        # Should call show with default filename
+        patched_graph_builder.net.show.assert_called_with('schema_graph.html')
+
+
+class TestYAMLCache:
+    """Tests for caching of parsed relationship files"""
+    
+    def test_repeat_load_skips_parse(self, sample_schema, sample_relationships, tmp_path):
+        """Test that an unchanged relationships file is parsed only once"""
+        rels_path = tmp_path / 'rels.yaml'
+        rels_path.write_text(yaml.dump(sample_relationships, Dumper=SafeDumper))
+        output_path = str(tmp_path / 'graph.json')
         
-        with patch('schema_graph_builder.graph.graph_builder.nx.readwrite.json_graph.node_link_data') as mock_node_link:
-            mock_node_link.return_value = {'nodes': [], 'links': []}
-            
-            build_graph(sample_schema, 'config.yaml', visualize=True, output_json_path='output/schema_graph.json')
+        with patch('schema_graph_builder.graph.graph_builder.yaml.load', wraps=yaml.load) as mock_load:
+            build_graph(sample_schema, str(rels_path), visualize=False, output_json_path=output_path)
+            build_graph(sample_schema, str(rels_path), visualize=False, output_json_path=output_path)
             
-            # Should call show with default filename
-            mock_net.show.assert_called_with('schema_graph.html') 
\ No newline at end of file
+            assert mock_load.call_count == 1
+        
+        with open(output_path) as f:
+            graph_data = json.load(f)
+        assert len(graph_data['nodes']) == 3
+    
+    def test_modified_file_is_reparsed(self, sample_relationships, tmp_path):
+        """Test that changing the file invalidates the cached entry"""
+        rels_path = tmp_path / 'rels.yaml'
+        rels_path.write_text(yaml.dump(sample_relationships, Dumper=SafeDumper))
+        
+        first = graph_builder._load_relationships(str(rels_path))
+        rels_path.write_text(yaml.dump({'customers': {'primary_key': 'customer_id', 'foreign_keys': []}}, Dumper=SafeDumper))
+        second = graph_builder._load_relationships(str(rels_path))
+        
+        assert set(first) == {'customers', 'orders', 'products'}
+        assert set(second) == {'customers'}
+    
+    def test_cached_result_is_a_copy(self, sample_relationships, tmp_path):
+        """Test that callers cannot mutate the cached data"""
+        rels_path = tmp_path / 'rels.yaml'
+        rels_path.write_text(yaml.dump(sample_relationships, Dumper=SafeDumper))
+        
+        first = graph_builder._load_relationships(str(rels_path))
+        first['orders']['foreign_keys'].clear()
+        second = graph_builder._load_relationships(str(rels_path))
+        
+        assert len(second['orders']['foreign_keys']) == 1
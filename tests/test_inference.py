@@ -235,6 +235,34 @@ class TestRelationshipInference:
         assert foreign_keys[0]['column'] == 'UserId'
         assert foreign_keys[0]['references'] == 'Users.UserId'
     
+    def test_infer_relationships_large_schema(self):
+        """Test inference over a generated 500-table schema"""
+        table_count = 500
+        schema = {
+            'database': 'testdb',
+            'tables': [
+                {
+                    'name': f'entity{i}s',
+                    'columns': [
+                        {'name': f'entity{i}_id', 'type': 'INTEGER', 'nullable': False, 'primary_key': True},
+                        {'name': f'entity{(i + 1) % table_count}_id', 'type': 'INTEGER', 'nullable': True, 'primary_key': False},
+                        {'name': 'description', 'type': 'TEXT', 'nullable': True, 'primary_key': False}
+                    ]
+                }
+                for i in range(table_count)
+            ]
+        }
+        
+        result = infer_relationships(schema)
+        
+        assert len(result) == table_count
+        for i in range(table_count):
+            foreign_keys = result[f'entity{i}s']['foreign_keys']
+            ref = (i + 1) % table_count
+            assert len(foreign_keys) == 1
+            assert foreign_keys[0]['references'] == f'entity{ref}s.entity{ref}_id'
+            assert foreign_keys[0]['confidence'] == 1.0
+    
     def test_infer_relationships_return_structure(self, sample_schema):
         """Test that return structure is consistent and correct"""
         result = infer_relationships(sample_schema)